@@ -4,110 +4,436 @@ import PIL.Image  # Import the Image class from PIL (Pillow) for image processin
 import PIL.ImageTk  # Import the ImageTk class to convert PIL images to Tkinter images
 import cv2  # Import OpenCV for computer vision tasks
 import webbrowser  # Import the webbrowser module to open links in the web browser
-from pyzbar.pyzbar import decode  # Import the decode function from pyzbar to decode barcodes
+from urllib.parse import urlparse  # Import urlparse to check the scheme of a selected link
+from pyzbar.pyzbar import decode, ZBarSymbol  # Import the decode function and symbol types from pyzbar to decode barcodes
 import numpy as np  # Import NumPy for numerical operations, including image array manipulation
 import pymsgbox  # Import pymsgbox for pop-up messages
+import threading  # Import threading to capture frames on a background thread
+import time  # Import time to force a periodic re-decode of an unchanged scene
+from concurrent.futures import ThreadPoolExecutor  # Import ThreadPoolExecutor to run pyzbar off the Tkinter thread
 
-# Initialize the camera capture object globally
+try:
+    from numba import njit  # Optional: compile the rectangle drawing loop to machine code
+except ImportError:
+    njit = None  # Fall back to drawing the rectangles with OpenCV
+
+# Initialize the camera capture object globally, along with the camera source it was opened for
 cap = None
+current_source = None
+
+# URL schemes that are opened directly without asking for confirmation
+SAFE_SCHEMES = frozenset({"http", "https"})
+
+# Camera properties applied (in this order) whenever a camera is opened
+CAPTURE_SETTINGS = {
+    cv2.CAP_PROP_BUFFERSIZE: 1,  # Keep only the most recent frame so reads are never several frames old
+    cv2.CAP_PROP_FRAME_WIDTH: 450,  # Set the width of the video capture to 450 pixels
+    cv2.CAP_PROP_FRAME_HEIGHT: 450,  # Set the height of the video capture to 450 pixels
+    cv2.CAP_PROP_FPS: 120,  # Set the frame rate of the video capture to 120 FPS
+    cv2.CAP_PROP_FOURCC: cv2.VideoWriter.fourcc('M', 'J', 'P', 'G'),  # Set the codec to MJPG
+}
 
 # Initialize a global set to keep track of seen barcodes
 seen_barcodes = set()
 
-def decode_barcodes_over_feed(image):
+# Drawing style of the barcode overlays on the camera feed
+FEED_COLOR = (225, 225, 225)
+FEED_THICKNESS = 2
+FEED_FONT = cv2.FONT_HERSHEY_SIMPLEX
+FEED_FONT_SCALE = 0.5
+
+# Drawing style of the barcode rectangles on a saved image (red in BGR)
+DETECT_COLOR = (0, 0, 255)
+DETECT_THICKNESS = 4
+
+# Thumbnail of the last decoded frame, when it was submitted, and its (x, y, w, h, text) overlays,
+# redrawn while the scene stays unchanged
+prev_thumb = None
+prev_decode_time = 0.0
+last_overlays = []
+
+# Total absolute difference between 16x16 grayscale thumbnails below which a frame counts as unchanged
+SCENE_CHANGE_THRESHOLD = 16 * 16 * 4
+
+# An unchanged scene is still re-decoded after this many seconds, since blur barely moves the thumbnail
+# and the cached decode may have run on a blurred frame that missed some codes
+SCENE_REFRESH_SECONDS = 0.5
+
+# Feed frames are decoded at 1/DECODE_SCALE resolution; barcode rectangles are scaled back up for drawing
+DECODE_SCALE = 2
+
+# Worker threads decoding feed frames; pyzbar releases the GIL while decoding, so two decodes overlap
+DECODE_WORKERS = 2
+pool = ThreadPoolExecutor(max_workers=DECODE_WORKERS)
+pending_decodes = []  # Futures of submitted feed decodes whose results have not been shown yet, oldest first
+
+# Barcode types pyzbar still has to look for once OpenCV has decoded the QR codes. NONE (0) must be left out
+# as well: zbar treats it as "every symbology" and enabling it would switch its QR decoder back on
+NON_QR_SYMBOLS = [
+    symbol for symbol in ZBarSymbol
+    if symbol not in (ZBarSymbol.NONE, ZBarSymbol.PARTIAL, ZBarSymbol.QRCODE)
+]
+
+# OpenCV QR code detector, one per thread since the decode workers run concurrently
+qr_detectors = threading.local()
+
+# Size-1 slot holding the newest frame from the reader thread (newer frames overwrite older ones)
+latest_frame = [None]
+frame_lock = threading.Lock()  # Guards access to latest_frame between the reader thread and Tkinter
+frame_wanted = threading.Event()  # Set once Tkinter has taken the current frame and is ready for another
+
+# Background thread reading the camera, the event used to tell it to stop and when it last got a frame
+reader_thread = None
+stop_event = None
+last_frame_time = 0.0
+
+# A running feed that has not delivered a frame for this many seconds counts as stalled and is reopened
+FEED_STALL_SECONDS = 1.0
+
+# Interval in milliseconds at which Tkinter checks the slot for a new frame (about 30 FPS). The reader
+# thread never calls into Tk itself: with threaded Tcl such calls block until the Tk thread services them,
+# which would deadlock against stop_feed() joining the thread from the Tk thread
+FRAME_POLL_MS = 33
+
+def read_frames(capture, stop):
     """
-    Function to decode barcodes from the image and update the Treeview with new barcodes.
+    Function run on a background thread that keeps reading the camera and stores the newest frame.
+    The capture is released here once the thread stops, so it is never released mid-read.
     """
-    global seen_barcodes  # Use the global set to track barcodes that have been seen
+    global last_frame_time
+
+    try:
+        while not stop.is_set():
+            # Grab every frame to keep the driver buffer drained (blocks until one is ready, no decoding yet)
+            if not capture.grab():
+                stop.wait(0.01)  # Avoid spinning if the camera is not delivering frames
+                continue
+            last_frame_time = time.monotonic()  # The camera is still delivering frames
+
+            # Drop the frame without its (MJPG) decode while Tkinter is still busy with the previous one
+            if not frame_wanted.is_set():
+                continue
+
+            ret, frame = capture.retrieve()  # Decode only the frame that will actually be shown
+            if not ret:
+                continue
+            frame_wanted.clear()
+
+            frame = cv2.flip(frame, 1)  # Flip the frame horizontally (mirror effect)
+
+            # Replace the previous frame so the consumer always sees the freshest one
+            with frame_lock:
+                latest_frame[0] = frame
+    finally:
+        capture.release()
+
+def stop_feed():
+    """
+    Function to stop the reader thread and release the camera if the feed is running.
+    """
+    global cap, reader_thread, stop_event, prev_thumb, last_overlays
 
-    # Convert the PIL image to a NumPy array for OpenCV processing
-    image_np = np.array(image)
+    # Tell the reader thread to stop and wait for it to finish its current read
+    if stop_event is not None:
+        stop_event.set()
+    if reader_thread is not None:
+        reader_thread.join(timeout=1)
 
-    # Decode barcodes from the given image using pyzbar
-    barcodes = decode(image_np)
-    
-    # Iterate over all detected barcodes
-    for i, barcode in enumerate(barcodes):
-        # Decode the barcode data to a string
-        barcode_data = barcode.data.decode("utf-8")
+    # The reader thread releases the camera on its way out; only release it here if no thread owns it
+    if cap is not None and (reader_thread is None or not reader_thread.is_alive()):
+        cap.release()
+
+    reader_thread = None
+    stop_event = None
+
+    # Drop the last frame so it is not mistaken for a live one
+    with frame_lock:
+        latest_frame[0] = None
+
+    # Forget the cached scene and any decodes still in flight so the next feed starts fresh
+    prev_thumb = None
+    last_overlays = []
+    for future in pending_decodes:
+        future.cancel()
+    pending_decodes.clear()
 
-        # Extract the coordinates and dimensions of the barcode bounding box
-        (x, y, w, h) = barcode.rect
+def show_image(label, img):
+    """
+    Function to display a PIL image on a Tkinter label, reusing the label's PhotoImage when the size matches.
+    """
+    img_tk = getattr(label, "imgtk", None)
+
+    if img_tk is not None and (img_tk.width(), img_tk.height()) == img.size:
+        # Copy the new pixels into the existing Tk photo image instead of allocating a new one
+        img_tk.paste(img)
+    else:
+        # First image (or the size changed): create the PhotoImage once and attach it to the label
+        img_tk = PIL.ImageTk.PhotoImage(image=img)
+        label.imgtk = img_tk  # Keep a reference to avoid garbage collection
+        label.configure(image=img_tk)
 
-        # Check if the barcode data has already been added to the Treeview
-        if barcode_data in seen_barcodes:
-            # Draw a rectangle around the barcode on the image (already seen)
-            cv2.rectangle(image_np, (x, y), (x + w, y + h), (225, 225, 225), 2)
-            # Put the barcode data as text above the rectangle
-            cv2.putText(image_np, barcode_data, (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (225, 225, 225), 2)
-            continue  # Skip this barcode if it has already been seen
+def insert_rows(rows):
+    """
+    Function to insert (text, values) rows into the Treeview in one batch, with its columns hidden
+    while inserting so the Treeview is laid out once instead of after every insert.
+    """
+    if not rows:
+        return
+
+    tree.configure(displaycolumns=())  # Hide the columns while the rows are inserted
+    try:
+        for text, values in rows:
+            tree.insert("", tk.END, text=text, values=values)
+    finally:
+        tree.configure(displaycolumns="#all")  # Show all columns again
+
+def decode_barcodes(gray):
+    """
+    Function to decode the codes in a grayscale image, returned as (data, type, (x, y, w, h)) tuples.
+    QR codes are decoded with OpenCV's native detector and the other barcode types with pyzbar, which also
+    takes over the QR codes whenever OpenCV fails to decode them.
+    """
+    # Create this thread's QR code detector on first use
+    qr = getattr(qr_detectors, "detector", None)
+    if qr is None:
+        qr = qr_detectors.detector = cv2.QRCodeDetector()
+
+    # Detect and decode all QR codes in the image in one call
+    ok, datas, points, _ = qr.detectAndDecodeMulti(gray)
+
+    # Keep only the QR codes that were actually decoded, with their corners turned into a bounding box
+    codes = []
+    if ok:
+        codes = [(data, "QRCODE", cv2.boundingRect(corners.astype(np.int32))) for data, corners in zip(datas, points) if data]
+
+    if codes and len(codes) == len(datas):
+        # Every QR code was decoded, so pyzbar only has to find the other (1D) barcode types
+        barcodes = decode(gray, symbols=NON_QR_SYMBOLS)
+    else:
+        # OpenCV found no QR code or failed to decode one, so let pyzbar look for every barcode type
+        barcodes = decode(gray)
+
+    # Merge the pyzbar results, skipping QR codes OpenCV already decoded
+    qr_datas = {data for (data, barcode_type, rect) in codes}
+    for barcode in barcodes:
+        data = barcode.data.decode("utf-8")
+        if barcode.type == "QRCODE" and data in qr_datas:
+            continue
+        codes.append((data, barcode.type, barcode.rect))
+
+    return codes
+
+if njit is not None:
+    # Explicit signatures make Numba compile (or load from its cache) at import instead of on the first
+    # detected barcode, which would freeze the Tkinter thread for the duration of the JIT compile
+    @njit("void(uint8[:, :, :], int64, int64, int64, int64, uint8[:])", cache=True)
+    def fill_region(img, y0, y1, x0, x1, color):
+        """
+        Function to paint the rows y0:y1 and columns x0:x1 of the image with a color, clipped to the image.
+        """
+        y0, x0 = max(y0, 0), max(x0, 0)
+        y1, x1 = min(y1, img.shape[0]), min(x1, img.shape[1])
+        if y0 < y1 and x0 < x1:
+            for c in range(img.shape[2]):
+                img[y0:y1, x0:x1, c] = color[c]
+
+    @njit("void(uint8[:, :, :], int64[:, :], uint8[:], int64)", cache=True)
+    def draw_rects(img, rects, color, thickness):
+        """
+        Function to paint the outline of every (x, y, w, h) rectangle in rects directly into the image buffer.
+        Like cv2.polylines, each edge is a band centred on the outline, thickness // 2 pixels to either side;
+        unlike OpenCV the corners are square rather than rounded, so the two paths are not pixel-identical.
+        """
+        half = thickness // 2
+        for i in range(rects.shape[0]):
+            x, y, w, h = rects[i, 0], rects[i, 1], rects[i, 2], rects[i, 3]
+            left, right = x - half, x + w + half + 1  # Outer column range of the outline
+            top, bottom = y - half, y + h + half + 1  # Outer row range of the outline
+            fill_region(img, top, y + half + 1, left, right, color)  # Top edge
+            fill_region(img, y + h - half, bottom, left, right, color)  # Bottom edge
+            fill_region(img, top, bottom, left, x + half + 1, color)  # Left edge
+            fill_region(img, top, bottom, x + w - half, right, color)  # Right edge
+else:
+    draw_rects = None
+
+def draw_boxes(img, rects, color, thickness):
+    """
+    Function to draw all (x, y, w, h) rectangles on the image in a single compiled call,
+    using Numba when it is installed and cv2.polylines otherwise.
+    """
+    if draw_rects is not None:
+        # Paint the outlines straight into the pixel buffer with the compiled helper
+        draw_rects(img, np.array(rects, dtype=np.int64).reshape(-1, 4), np.array(color, dtype=img.dtype), thickness)
+        return
 
-        # Add the barcode data to the seen set to avoid processing it again
-        seen_barcodes.add(barcode_data)
-        # Automatically open the barcode data (assuming it's a URL) in the default web browser
-        webbrowser.open(barcode_data)
+    # Turn every rectangle into its four corners so OpenCV can draw them all at once
+    contours = np.array([[[x, y], [x + w, y], [x + w, y + h], [x, y + h]] for (x, y, w, h) in rects], dtype=np.int32)
+    cv2.polylines(img, contours, isClosed=True, color=color, thickness=thickness)
 
-        # Draw a rectangle around the barcode on the image
-        cv2.rectangle(image_np, (x, y), (x + w, y + h), (225, 225, 225), 2)
+def decode_barcodes_over_feed(frame_bgr, rgb_out=None):
+    """
+    Function to decode barcodes from a BGR camera frame and update the Treeview with new barcodes.
+    The RGB image for display is written into rgb_out when a preallocated buffer is given.
+    """
+    global seen_barcodes  # Use the global set to track barcodes that have been seen
+    global prev_thumb, prev_decode_time, last_overlays
+
+    # Convert to grayscale once; pyzbar only looks at luminance anyway
+    gray = cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2GRAY)
+
+    # Shrink the frame to a tiny grayscale thumbnail to cheaply tell whether the scene changed
+    thumb = cv2.resize(gray, (16, 16), interpolation=cv2.INTER_AREA)
+
+    # Only trust the cached result while it is recent: it may come from a motion-blurred frame whose sharp
+    # successors look "unchanged" to the thumbnail diff, so it is redone every SCENE_REFRESH_SECONDS
+    now = time.monotonic()
+    needs_decode = (
+        prev_thumb is None
+        or now - prev_decode_time >= SCENE_REFRESH_SECONDS
+        or np.abs(thumb.astype(int) - prev_thumb).sum() >= SCENE_CHANGE_THRESHOLD
+    )
+
+    # Submit a new decode when needed, unless every worker is already busy
+    if needs_decode and len(pending_decodes) < DECODE_WORKERS:
+        # Decode barcodes from a downscaled grayscale image on a worker (rectangles are still drawn in color)
+        small = cv2.resize(gray, None, fx=1 / DECODE_SCALE, fy=1 / DECODE_SCALE, interpolation=cv2.INTER_AREA)
+        pending_decodes.append(pool.submit(decode_barcodes, small))
+        prev_thumb = thumb.astype(int)
+        prev_decode_time = now
+
+    # Take the newest finished decode; older ones that are still running are superseded by it
+    finished = [future for future in pending_decodes if future.done()]
+    if finished:
+        newest = finished[-1]
+        del pending_decodes[:pending_decodes.index(newest) + 1]
+        barcodes = newest.result()
+
+        # A decode finished, so rebuild the overlays from its barcodes
+        overlays = []
+        new_rows = []  # Treeview rows for barcodes that were not seen before
+
+        # Iterate over all detected barcodes
+        for i, (barcode_data, barcode_type, rect) in enumerate(barcodes):
+            # Extract the coordinates and dimensions of the barcode bounding box at full resolution
+            (x, y, w, h) = (v * DECODE_SCALE for v in rect)
+
+            # Check if the barcode data has already been added to the Treeview
+            if barcode_data in seen_barcodes:
+                # Label the barcode with its data only (already seen)
+                overlays.append((x, y, w, h, barcode_data))
+                continue  # Skip this barcode if it has already been seen
+
+            # Add the barcode data to the seen set to avoid processing it again
+            seen_barcodes.add(barcode_data)
+            # Automatically open the barcode data (assuming it's a URL) in the default web browser
+            webbrowser.open(barcode_data)
+
+            # Prepare the text to display (barcode data and type)
+            text = f"{barcode_data} ({barcode_type})"
+            overlays.append((x, y, w, h, text))
+
+            # Queue the barcode data for the Treeview with an ID and the decoded data
+            new_rows.append((i, (i+1, barcode_data)))
+
+        # Insert all new barcodes into the Treeview at once
+        insert_rows(new_rows)
+        last_overlays = overlays
+    else:
+        # No new decode result yet, so keep showing the overlays from the last one on the current frame
+        overlays = last_overlays
 
-        # Get the type of the barcode (e.g., QR Code, Code128)
-        barcode_type = barcode.type
+    # Draw on a copy only when there is something to draw, leaving the shared camera frame untouched
+    if overlays:
+        frame_bgr = frame_bgr.copy()
 
-        # Prepare the text to display (barcode data and type)
-        text = f"{barcode_data} ({barcode_type})"
-        
-        # Put the text above the rectangle on the image
-        cv2.putText(image_np, text, (x, y - 10), cv2.FONT_HERSHEY_SIMPLEX, 0.5, (225, 225, 225), 2)
+        # Draw the rectangles around all barcodes on the image in one call
+        draw_boxes(frame_bgr, [overlay[:4] for overlay in overlays], FEED_COLOR, FEED_THICKNESS)
 
-        # Insert the barcode data into the Treeview with an ID and the decoded data
-        tree.insert("", tk.END, text=i, values=(i+1, barcode_data))
+        # Put the text above each rectangle on the image
+        put_text = cv2.putText
+        for (x, y, w, h, text) in overlays:
+            put_text(frame_bgr, text, (x, y - 10), FEED_FONT, FEED_FONT_SCALE, FEED_COLOR, FEED_THICKNESS)
 
-    # Convert the NumPy array back to a PIL image and return it for display in Tkinter
-    return PIL.Image.fromarray(cv2.cvtColor(image_np, cv2.COLOR_BGR2RGB))
+    # Convert the BGR frame to RGB once and return it as a PIL image for display in Tkinter
+    return PIL.Image.fromarray(cv2.cvtColor(frame_bgr, cv2.COLOR_BGR2RGB, dst=rgb_out))
 
 def cam_feed(label):
     """
     Function to start the camera feed and continuously update the image on the Tkinter label.
     """
-    global cap
+    global cap, current_source, reader_thread, stop_event
+
+    # The selected camera is already streaming, so keep the running feed instead of reopening it.
+    # A feed whose reader died or whose camera stopped delivering frames is reopened to recover it
+    source = camera_source.get()
+    streaming = (
+        cap is not None
+        and cap.isOpened()
+        and current_source == source
+        and reader_thread is not None
+        and reader_thread.is_alive()
+        and time.monotonic() - last_frame_time < FEED_STALL_SECONDS
+    )
+    if streaming:
+        return
 
-    # Stop the previous feed update loop by releasing the camera if it's already running
-    if cap is not None:
-        cap.release()
+    # Stop the previous feed (reader thread and pending redraws) if it's already running
+    stop_feed()
 
     # Create a new VideoCapture object based on the selected camera source
-    cap = cv2.VideoCapture(camera_source.get())
+    cap = cv2.VideoCapture(source)
+    current_source = source
 
     # Setting the camera properties before capturing frames
-    cap.set(3, 450)  # Set the width of the video capture to 450 pixels
-    cap.set(4, 450)  # Set the height of the video capture to 450 pixels
-    cap.set(5, 120)  # Set the frame rate of the video capture to 120 FPS
-    cap.set(cv2.CAP_PROP_FOURCC, cv2.VideoWriter.fourcc('M', 'J', 'P', 'G'))  # Set the codec to MJPG
+    applied = {prop: cap.set(prop, value) for prop, value in CAPTURE_SETTINGS.items()}
+
+    # Some backends silently ignore the buffer size; the reader thread keeps the buffer drained anyway
+    if not applied[cv2.CAP_PROP_BUFFERSIZE]:
+        print("Warning: camera backend ignored CAP_PROP_BUFFERSIZE, relying on the reader thread to drain it")
+
+    # Start the reader thread that keeps the camera buffer drained, ready to decode the first frame
+    frame_wanted.set()
+    stop = stop_event = threading.Event()
+    reader_thread = threading.Thread(target=read_frames, args=(cap, stop), daemon=True)
+    reader_thread.start()
+
+    # Last frame that was displayed (stored in a list so the inner function can update it)
+    shown = [None]
+
+    # RGB buffer reused for every displayed frame, allocated once the frame size is known
+    rgb = [None]
 
     def update_frame():
         """
-        Inner function to update the camera feed frame by frame.
+        Inner function to update the camera feed with the newest frame.
         """
-        ret, frame = cap.read()  # Capture a frame from the camera
-        frame = cv2.flip(frame, 1)  # Flip the frame horizontally (mirror effect)
+        # Stop this update loop once its feed has been stopped
+        if stop.is_set():
+            return
 
-        if ret:
-            # Convert the BGR frame to RGB for display in Tkinter
-            rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        # Take the newest frame stored by the reader thread
+        with frame_lock:
+            frame = latest_frame[0]
 
-            # Convert the RGB frame to a PIL image
-            img = PIL.Image.fromarray(rgb)
+        # Only process the frame if the reader thread produced a new one since the last update
+        if frame is not None and frame is not shown[0]:
+            shown[0] = frame
 
-            # Decode barcodes over the feed and update the image with any detected barcodes
-            img = decode_barcodes_over_feed(img)
+            # Let the reader thread decode the next frame while this one is being processed
+            frame_wanted.set()
 
-            # Convert the PIL image to an ImageTk object for display in Tkinter
-            imgTk = PIL.ImageTk.PhotoImage(img)
-            label.imgtk = imgTk  # Keep a reference to avoid garbage collection
-            label.configure(image=imgTk)  # Update the label to display the new image
+            # Allocate the RGB buffer on the first frame (or if the camera changed resolution)
+            if rgb[0] is None or rgb[0].shape != frame.shape:
+                rgb[0] = np.empty_like(frame)
 
-        # Schedule the update_frame function to be called again after 10 milliseconds
-        label.after(10, update_frame)
+            # Decode barcodes over the raw BGR frame and get back the annotated image for display
+            img = decode_barcodes_over_feed(frame, rgb[0])
+
+            # Update the label to display the new image
+            show_image(label, img)
+
+        # Check for the next frame at roughly the camera's display rate
+        label.after(FRAME_POLL_MS, update_frame)
 
     # Start the update loop
     update_frame()
@@ -121,10 +447,11 @@ def take_picture():
     if cap is None or not cap.isOpened():
         pymsgbox.alert('Please start the video feed first.', 'Warning')  # Alert user if the camera feed is not running
     else:
-        ret, frame = cap.read()  # Capture a frame from the camera
-        frame = cv2.flip(frame, 1)  # Flip the frame horizontally (mirror effect)
+        # Take the newest (already mirrored) frame stored by the reader thread
+        with frame_lock:
+            frame = latest_frame[0]
 
-        if ret:
+        if frame is not None:
             # Save the captured frame as a JPEG file
             cv2.imwrite('captured_image.jpg', frame)
             print("Image captured and saved as 'captured_image.jpg'")
@@ -135,62 +462,39 @@ def detect_code(image="captured_image.jpg"):
     """
     Function to detect barcodes in a saved image file and update the Treeview with detected barcodes.
     """
-    global cap
-
-    # Release the camera if it's running to avoid conflict with loading a saved image
-    if cap is not None:
-        cap.release()
+    # Stop the feed if it's running to avoid conflict with loading a saved image
+    stop_feed()
 
     # Clear the tree data before inserting new data
-    for item in tree.get_children():
-        tree.delete(item)
-    
-    try:
-        # Open the image file using PIL
-        img = PIL.Image.open(image)
-        
-        # Convert the PIL image to a NumPy array for OpenCV processing
-        img_np = np.array(img)
-        
-        # Check if the image is valid (non-empty and of proper shape)
-        if img_np.size == 0:
-            raise ValueError("The image is empty or corrupted.")
-        
-    except (FileNotFoundError, ValueError) as e:
+    tree.delete(*tree.get_children())
+
+    # Read the image file straight into a BGR NumPy array with OpenCV
+    img_np = cv2.imread(image, cv2.IMREAD_COLOR)
+
+    if img_np is None or img_np.size == 0:
         # Handle the case where the file is not found or corrupted
-        pymsgbox.alert(f"Error: {str(e)}")
+        pymsgbox.alert(f"Error: Could not read the image '{image}'. It is missing or corrupted.")
         return
 
-    # Convert the PIL image to a NumPy array for OpenCV processing
-    img_np = np.array(img)
-
-    # Decode barcodes from the image using pyzbar
-    decoded_image = decode(cv2.cvtColor(img_np, cv2.COLOR_BGR2GRAY))
+    # Decode barcodes from the grayscale image
+    decoded_image = decode_barcodes(cv2.cvtColor(img_np, cv2.COLOR_BGR2GRAY))
 
     if len(decoded_image) == 0:
         # If no barcodes are detected, insert a message into the Treeview
         tree.insert("", tk.END, text="n/a", values=(1, "No barcodes detected"))
 
-    for i, barcode in enumerate(decoded_image):
-        # Extract the coordinates and dimensions of the barcode bounding box
-        (x, y, w, h) = barcode.rect
-
-        # Draw a rectangle around the detected barcode
-        cv2.rectangle(img_np, (x, y), (x + w, y + h), (0, 0, 255), 4)
+    # Insert the barcode data into the Treeview in one batch
+    insert_rows([(i, (i+1, data)) for i, (data, barcode_type, rect) in enumerate(decoded_image)])
 
-        # Decode the barcode data and type
-        data = barcode.data.decode("utf-8")
+    if decoded_image:
+        # Draw a rectangle around every detected barcode in one call
+        draw_boxes(img_np, [rect for (data, barcode_type, rect) in decoded_image], DETECT_COLOR, DETECT_THICKNESS)
 
-        # Insert the barcode data into the Treeview
-        tree.insert("", tk.END, text=i, values=(i+1, data))
-        
     # Convert the NumPy array back to a PIL image for display in Tkinter
     img_pil = PIL.Image.fromarray(cv2.cvtColor(img_np, cv2.COLOR_BGR2RGB))
-    img_tk = PIL.ImageTk.PhotoImage(image=img_pil)
-    
+
     # Update the label with the new image
-    cam_label.imgtk = img_tk
-    cam_label.configure(image=img_tk)
+    show_image(cam_label, img_pil)
 
 def select_link(event):
     """
@@ -205,7 +509,7 @@ def select_link(event):
     # Extract the actual data (link) from the values tuple
     link = values[1]
 
-    if link.startswith("https:"):
+    if urlparse(link).scheme in SAFE_SCHEMES:
         # Open the link in the default web browser
         webbrowser.open(link)
     else:
@@ -216,10 +520,18 @@ def select_link(event):
         else:
             print("User chose to cancel")
 
+def close_app():
+    """
+    Function to stop the camera feed and close the application window.
+    """
+    stop_feed()
+    root.destroy()
+
 # Main Tkinter application window
 root = tk.Tk()
 root.geometry("800x500")  # Set the window size
 root.title("Barcode detection")
+root.protocol("WM_DELETE_WINDOW", close_app)  # Stop the reader thread when the window is closed
 
 camera_source = tk.IntVar(value=0)  # Default to 0 (built-in camera)
 
@@ -244,7 +556,7 @@ show_feed = tk.Button(root, text="Start feed", command=lambda: cam_feed(cam_labe
 show_feed.place(x=470, y=110, width=120, height=40)
 
 # Button to exit the application
-exit_button = tk.Button(root, text="Exit", command=root.destroy, bg="red", fg="white")
+exit_button = tk.Button(root, text="Exit", command=close_app, bg="red", fg="white")
 exit_button.place(x=470, y=160, width=120, height=40)
 
 # Radio buttons to select the camera source (built-in or external webcam)
@@ -269,8 +581,8 @@ tree.place(x=470, y=270, width=320, height=225)
 # Start the Tkinter event loop
 root.mainloop()
 
-# Release the capture and close windows when the program ends
-if cap is not None:
-    cap.release()
+# Stop the reader thread, release the capture and close windows when the program ends
+stop_feed()
+pool.shutdown(wait=False)
 
 cv2.destroyAllWindows  # Clean up OpenCV resources